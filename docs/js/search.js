@@ -0,0 +1,287 @@
+(function () {
+  var form = document.querySelector('.site-search');
+  if (!form || !window.fetch) {
+    return;
+  }
+
+  var input = form.querySelector('.site-search__input');
+  var statusEl = form.querySelector('.site-search__status');
+  var resultsEl = form.querySelector('.site-search__results');
+  if (!input || !statusEl || !resultsEl) {
+    return;
+  }
+
+  var INDEX_ROOT = form.getAttribute('data-index') || 'search/';
+  var MAX_RESULTS = 10;
+
+  var manifestPromise = null;
+  var shardPromises = {};
+  var shardKeys = [];
+  var stopwords = {};
+  var bytesFetched = 0;
+  var pendingTimer = null;
+  var querySeq = 0;
+
+  function fetchText(url) {
+    return fetch(url).then(function (response) {
+      if (!response.ok) {
+        throw new Error('HTTP ' + response.status + ' for ' + url);
+      }
+      return response.text();
+    }).then(function (text) {
+      // Index files are ASCII apart from titles, so length tracks bytes closely.
+      bytesFetched += text.length;
+      return text;
+    });
+  }
+
+  function loadManifest() {
+    if (!manifestPromise) {
+      manifestPromise = fetchText(INDEX_ROOT + 'manifest.json').then(function (text) {
+        var manifest = JSON.parse(text);
+        shardKeys = Object.keys(manifest.shards);
+        manifest.stopwords.forEach(function (word) {
+          stopwords[word] = true;
+        });
+        return manifest;
+      });
+      manifestPromise.catch(function () {
+        manifestPromise = null;
+      });
+    }
+    return manifestPromise;
+  }
+
+  function loadShard(key) {
+    if (!shardPromises[key]) {
+      shardPromises[key] = fetchText(INDEX_ROOT + 'shards/' + key + '.json').then(JSON.parse);
+      shardPromises[key].catch(function () {
+        delete shardPromises[key];
+      });
+    }
+    return shardPromises[key];
+  }
+
+  // Mirrors tokenize() in tools/build_search_index.py.
+  function tokenize(text, manifest) {
+    var normalized = text.normalize ? text.normalize('NFKD').replace(/[\u0300-\u036f]/g, '') : text;
+    var raw = normalized.toLowerCase().match(/[a-z0-9]+/g) || [];
+    var seen = {};
+    return raw.filter(function (tok) {
+      if (tok.length < manifest.min_token_len || tok.length > manifest.max_token_len) {
+        return false;
+      }
+      if (stopwords[tok] || seen[tok]) {
+        return false;
+      }
+      seen[tok] = true;
+      return true;
+    });
+  }
+
+  // A term lives in the shard with the longest key that prefixes it.
+  function shardFor(term) {
+    var best = null;
+    shardKeys.forEach(function (key) {
+      if (term.lastIndexOf(key, 0) === 0 && (!best || key.length > best.length)) {
+        best = key;
+      }
+    });
+    return best;
+  }
+
+  function plan(tokens, manifest) {
+    return tokens.map(function (tok, i) {
+      var keys = [];
+      var own = shardFor(tok);
+      if (own) {
+        keys.push(own);
+      }
+      var isPrefix = i === tokens.length - 1 && tok.length >= manifest.prefix_query_min_len;
+      if (isPrefix) {
+        shardKeys.forEach(function (key) {
+          if (key !== own && key.lastIndexOf(tok, 0) === 0) {
+            keys.push(key);
+          }
+        });
+      }
+      return { token: tok, prefix: isPrefix, keys: keys };
+    });
+  }
+
+  function scoreToken(entry, shards, docCount) {
+    var scores = {};
+    entry.keys.forEach(function (key) {
+      var shard = shards[key];
+      Object.keys(shard).forEach(function (term) {
+        var matches = entry.prefix ? term.lastIndexOf(entry.token, 0) === 0 : term === entry.token;
+        if (!matches) {
+          return;
+        }
+        var postings = shard[term];
+        var idf = Math.log(1 + docCount / (postings.length / 2));
+        for (var i = 0; i < postings.length; i += 2) {
+          scores[postings[i]] = (scores[postings[i]] || 0) + postings[i + 1] * idf;
+        }
+      });
+    });
+    return scores;
+  }
+
+  function search(query) {
+    return loadManifest().then(function (manifest) {
+      var tokens = tokenize(query, manifest);
+      var entries = plan(tokens, manifest);
+      var needed = {};
+      entries.forEach(function (entry) {
+        entry.keys.forEach(function (key) {
+          needed[key] = true;
+        });
+      });
+      var keys = Object.keys(needed);
+      var queryBytes = keys.reduce(function (sum, key) {
+        return sum + manifest.shards[key];
+      }, 0);
+
+      return Promise.all(keys.map(loadShard)).then(function (loaded) {
+        var shards = {};
+        keys.forEach(function (key, i) {
+          shards[key] = loaded[i];
+        });
+
+        var totals = null;
+        entries.forEach(function (entry) {
+          var scores = scoreToken(entry, shards, manifest.docs.length);
+          if (totals === null) {
+            totals = scores;
+            return;
+          }
+          var merged = {};
+          Object.keys(totals).forEach(function (docId) {
+            if (scores[docId]) {
+              merged[docId] = totals[docId] + scores[docId];
+            }
+          });
+          totals = merged;
+        });
+
+        var hits = Object.keys(totals || {}).map(function (docId) {
+          return { doc: manifest.docs[docId], score: totals[docId] };
+        }).sort(function (a, b) {
+          return b.score - a.score;
+        });
+
+        return {
+          tokens: tokens,
+          hits: hits,
+          shardCount: keys.length,
+          shardBytes: queryBytes
+        };
+      });
+    });
+  }
+
+  function formatKb(bytes) {
+    return (bytes / 1024).toFixed(1) + ' KB';
+  }
+
+  function clearResults() {
+    resultsEl.innerHTML = '';
+    statusEl.textContent = '';
+    form.classList.remove('is-open');
+  }
+
+  function render(result, elapsed) {
+    resultsEl.innerHTML = '';
+    result.hits.slice(0, MAX_RESULTS).forEach(function (hit) {
+      var item = document.createElement('li');
+      item.className = 'site-search__result';
+
+      var link = document.createElement('a');
+      link.href = hit.doc.url;
+      link.textContent = hit.doc.title;
+      if (hit.doc.kind === 'pdf') {
+        link.target = '_blank';
+        link.rel = 'noopener';
+      }
+      item.appendChild(link);
+
+      var meta = document.createElement('span');
+      meta.className = 'site-search__meta';
+      meta.textContent = hit.doc.kind === 'pdf'
+        ? 'PDF' + (hit.doc.page ? ' \u00b7 ' + hit.doc.page.replace(/\.html$/, '') : '')
+        : 'Page';
+      item.appendChild(meta);
+
+      resultsEl.appendChild(item);
+    });
+
+    var count = result.hits.length;
+    statusEl.textContent = (count ? count + (count === 1 ? ' result' : ' results') : 'No results') +
+      ' \u00b7 ' + result.shardCount + (result.shardCount === 1 ? ' shard, ' : ' shards, ') +
+      formatKb(result.shardBytes) + ' \u00b7 ' + Math.round(elapsed) + ' ms';
+    form.classList.add('is-open');
+    form.setAttribute('data-bytes-fetched', String(bytesFetched));
+  }
+
+  function runQuery() {
+    var query = input.value.trim();
+    var seq = ++querySeq;
+    if (!query) {
+      clearResults();
+      return;
+    }
+    var started = window.performance ? performance.now() : Date.now();
+    search(query).then(function (result) {
+      if (seq !== querySeq) {
+        return;
+      }
+      if (!result.tokens.length) {
+        clearResults();
+        return;
+      }
+      var now = window.performance ? performance.now() : Date.now();
+      render(result, now - started);
+    }).catch(function () {
+      if (seq === querySeq) {
+        resultsEl.innerHTML = '';
+        statusEl.textContent = 'Search is unavailable right now.';
+        form.classList.add('is-open');
+      }
+    });
+  }
+
+  input.addEventListener('focus', function () {
+    loadManifest();
+  }, { once: true });
+
+  input.addEventListener('input', function () {
+    window.clearTimeout(pendingTimer);
+    pendingTimer = window.setTimeout(runQuery, 150);
+  });
+
+  form.addEventListener('submit', function (event) {
+    event.preventDefault();
+    window.clearTimeout(pendingTimer);
+    runQuery();
+  });
+
+  document.addEventListener('keydown', function (event) {
+    if (event.key === 'Escape' && form.classList.contains('is-open')) {
+      clearResults();
+      input.blur();
+    }
+  });
+
+  document.addEventListener('click', function (event) {
+    if (!form.contains(event.target)) {
+      form.classList.remove('is-open');
+    }
+  });
+
+  input.addEventListener('focus', function () {
+    if (resultsEl.children.length || statusEl.textContent) {
+      form.classList.add('is-open');
+    }
+  });
+})();
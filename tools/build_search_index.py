@@ -0,0 +1,784 @@
+#!/usr/bin/env python3
+import re
+import sys
+import json
+import time
+import zlib
+import hashlib
+import argparse
+import unicodedata
+from collections import namedtuple
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import quote, unquote
+
+ROOT = Path(__file__).resolve().parents[1]
+DOCS_DIR = ROOT / "docs"
+OUT_DIR = DOCS_DIR / "search"
+CACHE_PATH = ROOT / "tools" / ".search_cache.json"
+
+# Bump when extraction output changes so cached text is regenerated.
+EXTRACTOR_VERSION = 1
+
+MIN_TOKEN_LEN = 2
+MAX_TOKEN_LEN = 32
+MAX_SHARD_BYTES = 16 * 1024
+MAX_PREFIX_LEN = 4
+# The client only expands the last query token as a prefix once it is this long.
+PREFIX_QUERY_MIN_LEN = 3
+
+STOPWORDS = sorted({
+    "a", "about", "after", "all", "also", "an", "and", "any", "are", "as", "at",
+    "be", "been", "but", "by", "can", "could", "do", "does", "each", "for",
+    "from", "had", "has", "have", "he", "her", "his", "how", "if", "in", "into",
+    "is", "it", "its", "may", "more", "most", "no", "not", "of", "on", "or",
+    "other", "our", "out", "so", "some", "such", "than", "that", "the", "their",
+    "them", "then", "there", "these", "they", "this", "those", "to", "up", "was",
+    "we", "were", "what", "when", "where", "which", "who", "will", "with",
+    "would", "you", "your",
+})
+STOPWORD_SET = frozenset(STOPWORDS)
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+PDF_ID_PREFIX_RE = re.compile(r"^[0-9a-f]{24}_")
+
+
+def tokenize(text: str):
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    for tok in TOKEN_RE.findall(text):
+        if MIN_TOKEN_LEN <= len(tok) <= MAX_TOKEN_LEN and tok not in STOPWORD_SET:
+            yield tok
+
+
+# ---------------------------------------------------------------------------
+# HTML extraction
+# ---------------------------------------------------------------------------
+
+class PageTextParser(HTMLParser):
+    SKIP_TAGS = {"script", "style", "noscript", "template", "form"}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.chunks = []
+        self.links = []
+        self._skip = 0
+        self._in_title = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag == "a":
+            href = dict(attrs).get("href") or ""
+            if href:
+                self.links.append(href)
+        self.chunks.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip:
+            self._skip -= 1
+        elif tag == "title":
+            self._in_title = False
+        self.chunks.append(" ")
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+        elif not self._skip:
+            self.chunks.append(data)
+
+
+def parse_html(data: bytes):
+    parser = PageTextParser()
+    parser.feed(data.decode("utf-8", errors="ignore"))
+    parser.close()
+    text = re.sub(r"\s+", " ", "".join(parser.chunks)).strip()
+    return parser.title.strip(), text, parser.links
+
+
+# ---------------------------------------------------------------------------
+# PDF extraction (stdlib only: FlateDecode streams + ToUnicode CMaps)
+# ---------------------------------------------------------------------------
+
+Ref = namedtuple("Ref", "num")
+
+PDF_WS = b" \t\r\n\f\x00"
+PDF_TOKEN_RE = re.compile(rb"[^ \t\r\n\f\x00()<>\[\]{}/%]+")
+PDF_OBJ_RE = re.compile(rb"(\d+)\s+\d+\s+obj\b")
+PDF_STREAM_RE = re.compile(rb"stream\r?\n")
+LITERAL_ESCAPES = {
+    ord("n"): b"\n", ord("r"): b"\r", ord("t"): b"\t", ord("b"): b"\b",
+    ord("f"): b"\f", ord("("): b"(", ord(")"): b")", ord("\\"): b"\\",
+}
+
+
+class PDFLexer:
+    """Tokenizer shared by object bodies and page content streams."""
+
+    def __init__(self, data: bytes, pos: int = 0):
+        self.data = data
+        self.pos = pos
+
+    def skip_ws(self):
+        data, n = self.data, len(self.data)
+        while self.pos < n:
+            c = data[self.pos]
+            if c in PDF_WS:
+                self.pos += 1
+            elif c == 0x25:  # comment
+                end = data.find(b"\n", self.pos)
+                self.pos = n if end < 0 else end + 1
+            else:
+                break
+
+    def next_token(self):
+        """Return (kind, value) or None at end of data."""
+        self.skip_ws()
+        data, pos = self.data, self.pos
+        if pos >= len(data):
+            return None
+        c = data[pos:pos + 1]
+        if c == b"(":
+            return "str", self._read_literal()
+        if c == b"<":
+            if data[pos + 1:pos + 2] == b"<":
+                self.pos += 2
+                return "op", b"<<"
+            end = data.find(b">", pos)
+            end = len(data) if end < 0 else end
+            hexdata = re.sub(rb"[^0-9A-Fa-f]", b"", data[pos + 1:end])
+            if len(hexdata) % 2:
+                hexdata += b"0"
+            self.pos = end + 1
+            return "str", bytes.fromhex(hexdata.decode("ascii"))
+        if c == b">":
+            self.pos += 2 if data[pos + 1:pos + 2] == b">" else 1
+            return "op", b">>"
+        if c in (b"[", b"]", b"{", b"}"):
+            self.pos += 1
+            return "op", c
+        if c == b"/":
+            m = PDF_TOKEN_RE.match(data, pos + 1)
+            self.pos = m.end() if m else pos + 1
+            name = m.group(0) if m else b""
+            name = re.sub(rb"#([0-9A-Fa-f]{2})", lambda h: bytes.fromhex(h.group(1).decode()), name)
+            return "name", name.decode("latin-1")
+        m = PDF_TOKEN_RE.match(data, pos)
+        if not m:
+            self.pos += 1
+            return "op", c
+        self.pos = m.end()
+        tok = m.group(0)
+        try:
+            return "num", int(tok)
+        except ValueError:
+            pass
+        try:
+            return "num", float(tok)
+        except ValueError:
+            return "op", tok
+
+    def _read_literal(self):
+        data, pos = self.data, self.pos + 1
+        out = bytearray()
+        depth = 1
+        n = len(data)
+        while pos < n:
+            c = data[pos]
+            if c == 0x5C:  # backslash
+                pos += 1
+                if pos >= n:
+                    break
+                e = data[pos]
+                if e in LITERAL_ESCAPES:
+                    out += LITERAL_ESCAPES[e]
+                    pos += 1
+                elif 0x30 <= e <= 0x37:
+                    m = re.match(rb"[0-7]{1,3}", data[pos:pos + 3])
+                    out.append(int(m.group(0), 8) & 0xFF)
+                    pos += len(m.group(0))
+                elif e in (0x0D, 0x0A):
+                    pos += 2 if data[pos:pos + 2] == b"\r\n" else 1
+                else:
+                    out.append(e)
+                    pos += 1
+                continue
+            if c == 0x28:
+                depth += 1
+            elif c == 0x29:
+                depth -= 1
+                if depth == 0:
+                    pos += 1
+                    break
+            out.append(c)
+            pos += 1
+        self.pos = pos
+        return bytes(out)
+
+    def read_object(self):
+        """Parse one PDF object (dicts, arrays, refs included)."""
+        tok = self.next_token()
+        if tok is None:
+            return None
+        kind, val = tok
+        if kind == "num" and isinstance(val, int):
+            save = self.pos
+            t2 = self.next_token()
+            t3 = self.next_token()
+            if t2 and t3 and t2[0] == "num" and t3 == ("op", b"R"):
+                return Ref(val)
+            self.pos = save
+            return val
+        if kind in ("num", "str", "name"):
+            return val
+        if val == b"<<":
+            out = {}
+            while True:
+                self.skip_ws()
+                if self.data.startswith(b">>", self.pos) or self.pos >= len(self.data):
+                    self.pos += 2
+                    return out
+                key = self.next_token()
+                if key is None or key[0] != "name":
+                    continue
+                out[key[1]] = self.read_object()
+        if val == b"[":
+            out = []
+            while True:
+                self.skip_ws()
+                if self.pos >= len(self.data):
+                    return out
+                if self.data[self.pos:self.pos + 1] == b"]":
+                    self.pos += 1
+                    return out
+                out.append(self.read_object())
+        if val == b"true":
+            return True
+        if val == b"false":
+            return False
+        return None
+
+
+def inflate(data: bytes) -> bytes:
+    try:
+        return zlib.decompressobj().decompress(data)
+    except zlib.error:
+        return b""
+
+
+class PDFDocument:
+    def __init__(self, data: bytes):
+        self.data = data
+        self.objects = {}
+        self.streams = {}
+        self._decoded = {}
+        self._font_cache = {}
+        self._scan_objects()
+
+    def _scan_objects(self):
+        data = self.data
+        skip_until = 0
+        for m in PDF_OBJ_RE.finditer(data):
+            if m.start() < skip_until:
+                continue
+            num = int(m.group(1))
+            lexer = PDFLexer(data, m.end())
+            try:
+                obj = lexer.read_object()
+            except (ValueError, IndexError):
+                continue
+            self.objects[num] = obj
+            if isinstance(obj, dict):
+                lexer.skip_ws()
+                sm = PDF_STREAM_RE.match(data, lexer.pos)
+                if sm:
+                    start = sm.end()
+                    length = obj.get("Length")
+                    if isinstance(length, int) and data[start + length:start + length + 20].lstrip().startswith(b"endstream"):
+                        end = start + length
+                    else:
+                        end = data.find(b"endstream", start)
+                        end = len(data) if end < 0 else end
+                    self.streams[num] = data[start:end]
+                    skip_until = end
+        for num, obj in list(self.objects.items()):
+            if isinstance(obj, dict) and obj.get("Type") == "ObjStm":
+                self._expand_object_stream(num, obj)
+
+    def _expand_object_stream(self, num, header):
+        raw = self.stream_data(num)
+        count, first = header.get("N"), header.get("First")
+        if not raw or not isinstance(count, int) or not isinstance(first, int):
+            return
+        lexer = PDFLexer(raw)
+        pairs = []
+        for _ in range(count):
+            a, b = lexer.next_token(), lexer.next_token()
+            if not a or not b:
+                break
+            pairs.append((a[1], b[1]))
+        for objnum, offset in pairs:
+            if objnum in self.objects or not isinstance(offset, int):
+                continue
+            self.objects[objnum] = PDFLexer(raw, first + offset).read_object()
+
+    def resolve(self, obj, depth=0):
+        while isinstance(obj, Ref) and depth < 32:
+            obj = self.objects.get(obj.num)
+            depth += 1
+        return obj
+
+    def stream_data(self, num):
+        if num in self._decoded:
+            return self._decoded[num]
+        raw = self.streams.get(num, b"")
+        header = self.objects.get(num) or {}
+        filters = self.resolve(header.get("Filter"))
+        if isinstance(filters, str):
+            filters = [filters]
+        out = raw
+        for f in filters or []:
+            if f in ("FlateDecode", "Fl"):
+                out = inflate(out)
+            else:
+                out = b""
+                break
+        self._decoded[num] = out
+        return out
+
+    def pages(self):
+        root = None
+        for obj in self.objects.values():
+            if isinstance(obj, dict) and obj.get("Type") == "Catalog":
+                root = obj
+        if root is None:
+            return
+        seen = set()
+        stack = [(root.get("Pages"), None)]
+        while stack:
+            ref, inherited = stack.pop()
+            if isinstance(ref, Ref):
+                if ref.num in seen:
+                    continue
+                seen.add(ref.num)
+            node = self.resolve(ref)
+            if not isinstance(node, dict):
+                continue
+            resources = self.resolve(node.get("Resources")) or inherited
+            kids = self.resolve(node.get("Kids"))
+            if isinstance(kids, list):
+                for kid in reversed(kids):
+                    stack.append((kid, resources))
+            elif node.get("Type") == "Page" or "Contents" in node:
+                yield node, resources or {}
+
+    def page_content(self, page):
+        contents = self.resolve(page.get("Contents"))
+        refs = contents if isinstance(contents, list) else [page.get("Contents")]
+        return b"\n".join(self.stream_data(r.num) for r in refs if isinstance(r, Ref))
+
+    def font_decoder(self, ref):
+        key = ref.num if isinstance(ref, Ref) else id(ref)
+        if key not in self._font_cache:
+            self._font_cache[key] = FontDecoder(self, self.resolve(ref))
+        return self._font_cache[key]
+
+
+class FontDecoder:
+    def __init__(self, doc: PDFDocument, font):
+        font = font if isinstance(font, dict) else {}
+        self.composite = font.get("Subtype") == "Type0"
+        self.cmap = {}
+        self.code_lengths = []
+        to_unicode = font.get("ToUnicode")
+        if isinstance(to_unicode, Ref):
+            self._parse_cmap(doc.stream_data(to_unicode.num))
+
+    def _parse_cmap(self, data: bytes):
+        lexer = PDFLexer(data)
+        operands = []
+        lengths = set()
+        while True:
+            tok = lexer.next_token()
+            if tok is None:
+                break
+            kind, val = tok
+            if kind == "op" and val == b"[":
+                arr = []
+                while True:
+                    t = lexer.next_token()
+                    if t is None or t == ("op", b"]"):
+                        break
+                    if t[0] == "str":
+                        arr.append(t[1])
+                operands.append(arr)
+                continue
+            if kind != "op":
+                operands.append(val)
+                continue
+            if val == b"endbfchar":
+                for src, dst in zip(operands[0::2], operands[1::2]):
+                    if isinstance(src, bytes) and isinstance(dst, bytes):
+                        self.cmap[src] = utf16(dst)
+                        lengths.add(len(src))
+            elif val == b"endbfrange":
+                for i in range(0, len(operands) - 2, 3):
+                    lo, hi, dst = operands[i:i + 3]
+                    if not isinstance(lo, bytes) or not isinstance(hi, bytes) or not lo:
+                        continue
+                    width = len(lo)
+                    lo_i, hi_i = int.from_bytes(lo, "big"), int.from_bytes(hi, "big")
+                    if hi_i - lo_i > 0xFFFF:
+                        continue
+                    for offset, code in enumerate(range(lo_i, hi_i + 1)):
+                        src = code.to_bytes(width, "big")
+                        if isinstance(dst, list):
+                            if offset >= len(dst):
+                                break
+                            self.cmap[src] = utf16(dst[offset])
+                        elif isinstance(dst, bytes) and dst:
+                            base = int.from_bytes(dst, "big") + offset
+                            self.cmap[src] = utf16(base.to_bytes(len(dst), "big"))
+                    lengths.add(width)
+            operands = []
+        self.code_lengths = sorted(lengths, reverse=True)
+
+    def decode(self, raw: bytes) -> str:
+        if not self.cmap:
+            # Simple fonts without a ToUnicode map are close enough to WinAnsi;
+            # composite fonts without one carry glyph ids we cannot map.
+            return "" if self.composite else raw.decode("cp1252", errors="ignore")
+        out = []
+        pos, n = 0, len(raw)
+        step = 2 if self.composite else 1
+        while pos < n:
+            for width in self.code_lengths:
+                hit = self.cmap.get(raw[pos:pos + width])
+                if hit is not None:
+                    out.append(hit)
+                    pos += width
+                    break
+            else:
+                pos += step
+        return "".join(out)
+
+
+def utf16(data: bytes) -> str:
+    if len(data) % 2:
+        data = b"\x00" + data
+    return data.decode("utf-16-be", errors="ignore")
+
+
+# Some generators (Skia, macOS Quartz) position each glyph run of a word on its
+# own, so only moves to a new line -- or back along the same one -- count as
+# word breaks; spaces within a line come from the space glyphs themselves.
+# TJ adjustments beyond this (thousandths of an em) are gaps between words.
+TJ_SPACE_THRESHOLD = 200
+
+
+def extract_content_text(doc: PDFDocument, content: bytes, resources, out: list, depth=0):
+    resources = resources if isinstance(resources, dict) else {}
+    fonts = doc.resolve(resources.get("Font"))
+    fonts = fonts if isinstance(fonts, dict) else {}
+    xobjects = doc.resolve(resources.get("XObject"))
+    xobjects = xobjects if isinstance(xobjects, dict) else {}
+    decoder = None
+    line = None
+    operands = []
+    lexer = PDFLexer(content)
+    while True:
+        tok = lexer.next_token()
+        if tok is None:
+            break
+        kind, val = tok
+        if kind != "op":
+            operands.append(val)
+            continue
+        if val == b"[":
+            arr = []
+            while True:
+                t = lexer.next_token()
+                if t is None or t == ("op", b"]"):
+                    break
+                if t[0] in ("str", "num"):
+                    arr.append(t[1])
+            operands.append(arr)
+            continue
+        if val == b"<<":
+            lexer.pos -= 2
+            operands.append(lexer.read_object())
+            continue
+        if val == b"BI":
+            end = re.compile(rb"\sEI(?=[\s]|$)").search(content, lexer.pos)
+            lexer.pos = end.end() if end else len(content)
+            operands = []
+            continue
+        if val == b"Tf" and len(operands) >= 2 and isinstance(operands[-2], str):
+            decoder = doc.font_decoder(fonts.get(operands[-2]))
+        elif val in (b"Tj", b"'", b'"') and operands and isinstance(operands[-1], bytes):
+            if val != b"Tj":
+                out.append(" ")
+                line = None
+            if decoder is not None:
+                out.append(decoder.decode(operands[-1]))
+        elif val == b"TJ" and operands and isinstance(operands[-1], list):
+            for item in operands[-1]:
+                if isinstance(item, bytes):
+                    if decoder is not None:
+                        out.append(decoder.decode(item))
+                elif item < -TJ_SPACE_THRESHOLD:
+                    out.append(" ")
+        elif val == b"Tm" and len(operands) >= 6:
+            x, y = operands[-2], operands[-1]
+            if line is None or y != line[1] or x < line[0]:
+                out.append(" ")
+            line = (x, y)
+        elif val in (b"Td", b"TD") and len(operands) >= 2:
+            if operands[-1] != 0:
+                out.append(" ")
+                line = None
+        elif val == b"T*":
+            out.append(" ")
+            line = None
+        elif val == b"Do" and operands and isinstance(operands[-1], str) and depth < 8:
+            ref = xobjects.get(operands[-1])
+            xobj = doc.resolve(ref)
+            if isinstance(ref, Ref) and isinstance(xobj, dict) and xobj.get("Subtype") == "Form":
+                sub_resources = doc.resolve(xobj.get("Resources")) or resources
+                extract_content_text(doc, doc.stream_data(ref.num), sub_resources, out, depth + 1)
+        operands = []
+
+
+def extract_pdf_text(data: bytes) -> str:
+    doc = PDFDocument(data)
+    out = []
+    for page, resources in doc.pages():
+        extract_content_text(doc, doc.page_content(page), resources, out)
+        out.append("\n")
+    return re.sub(r"\s+", " ", "".join(out)).strip()
+
+
+# ---------------------------------------------------------------------------
+# Extraction cache
+# ---------------------------------------------------------------------------
+
+def load_cache() -> dict:
+    try:
+        cache = json.loads(CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != EXTRACTOR_VERSION:
+        return {}
+    return cache.get("entries", {})
+
+
+def save_cache(entries: dict):
+    CACHE_PATH.write_text(
+        json.dumps({"version": EXTRACTOR_VERSION, "entries": entries}, separators=(",", ":")),
+        encoding="utf-8",
+    )
+
+
+def cached_extract(path: Path, cache: dict, fresh: dict, extract):
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    entry = cache.get(digest)
+    hit = entry is not None
+    if not hit:
+        entry = extract(data)
+    fresh[digest] = entry
+    return entry, hit
+
+
+# ---------------------------------------------------------------------------
+# Document collection
+# ---------------------------------------------------------------------------
+
+def site_url(path: Path) -> str:
+    return quote(path.relative_to(DOCS_DIR).as_posix())
+
+
+def pdf_title(path: Path) -> str:
+    name = PDF_ID_PREFIX_RE.sub("", unquote(path.stem))
+    return re.sub(r"[_\s]+", " ", name).strip()
+
+
+def collect_documents(cache: dict, fresh: dict, stats: dict):
+    docs = []
+    linked_from = {}
+
+    def parse_page(data):
+        title, text, links = parse_html(data)
+        return {"title": title, "text": text, "links": links}
+
+    for page in sorted(DOCS_DIR.glob("*.html")):
+        entry, hit = cached_extract(page, cache, fresh, parse_page)
+        stats["cache_hits" if hit else "cache_misses"] += 1
+        for href in entry["links"]:
+            target = href.split("#", 1)[0]
+            if target.lower().endswith(".pdf"):
+                linked_from.setdefault(target, page.name)
+        docs.append({
+            "url": site_url(page),
+            "title": entry["title"] or page.stem,
+            "kind": "page",
+            "text": entry["title"] + " " + entry["text"],
+        })
+
+    for pdf in sorted(DOCS_DIR.rglob("*.pdf")):
+        text, hit = cached_extract(pdf, cache, fresh, extract_pdf_text)
+        stats["cache_hits" if hit else "cache_misses"] += 1
+        rel = pdf.relative_to(DOCS_DIR).as_posix()
+        title = pdf_title(pdf)
+        if not text:
+            stats["empty_pdfs"].append(rel)
+        doc = {"url": site_url(pdf), "title": title, "kind": "pdf", "text": title + " " + text}
+        page = linked_from.get(rel)
+        if page:
+            doc["page"] = page
+        docs.append(doc)
+    return docs
+
+
+# ---------------------------------------------------------------------------
+# Index building
+# ---------------------------------------------------------------------------
+
+def build_postings(docs):
+    postings = {}
+    for doc_id, doc in enumerate(docs):
+        counts = {}
+        for tok in tokenize(doc["text"]):
+            counts[tok] = counts.get(tok, 0) + 1
+        for tok, tf in counts.items():
+            postings.setdefault(tok, []).extend((doc_id, tf))
+    return postings
+
+
+def encode_entry(term: str, flat: list) -> str:
+    return json.dumps(term) + ":" + json.dumps(flat, separators=(",", ":"))
+
+
+def plan_shards(terms, entry_sizes, max_bytes, depth=1):
+    """Group terms by prefix, splitting any group over max_bytes one level deeper.
+
+    A shard keyed ``k`` holds every term starting with ``k`` that is not claimed
+    by a longer key, so a term lives in the shard with the longest matching key.
+    """
+    groups = {}
+    for term in terms:
+        groups.setdefault(term[:depth], []).append(term)
+    shards = {}
+    for key, members in groups.items():
+        size = sum(entry_sizes[t] for t in members)
+        if size <= max_bytes or depth >= MAX_PREFIX_LEN:
+            shards[key] = members
+            continue
+        # Terms no longer than the prefix cannot be split further.
+        stay = [t for t in members if len(t) == depth]
+        if stay:
+            shards[key] = stay
+        shards.update(plan_shards([t for t in members if len(t) > depth], entry_sizes, max_bytes, depth + 1))
+    return shards
+
+
+def shard_for(term: str, keys):
+    for n in range(min(len(term), MAX_PREFIX_LEN), 0, -1):
+        if term[:n] in keys:
+            return term[:n]
+    return None
+
+
+def shards_for_query(query: str, keys):
+    tokens = list(dict.fromkeys(tokenize(query)))
+    needed = set()
+    for i, tok in enumerate(tokens):
+        key = shard_for(tok, keys)
+        if key:
+            needed.add(key)
+        if i == len(tokens) - 1 and len(tok) >= PREFIX_QUERY_MIN_LEN:
+            needed.update(k for k in keys if k.startswith(tok))
+    return sorted(needed)
+
+
+def write_index(docs, postings, max_bytes):
+    shard_dir = OUT_DIR / "shards"
+    shard_dir.mkdir(parents=True, exist_ok=True)
+    for old in shard_dir.glob("*.json"):
+        old.unlink()
+
+    entries = {term: encode_entry(term, flat) for term, flat in postings.items()}
+    entry_sizes = {term: len(e) + 1 for term, e in entries.items()}
+    shards = plan_shards(sorted(entries), entry_sizes, max_bytes)
+
+    shard_sizes = {}
+    for key, terms in sorted(shards.items()):
+        body = "{" + ",".join(entries[t] for t in sorted(terms)) + "}"
+        (shard_dir / f"{key}.json").write_text(body, encoding="utf-8")
+        shard_sizes[key] = len(body.encode("utf-8"))
+
+    manifest = {
+        "version": 1,
+        "min_token_len": MIN_TOKEN_LEN,
+        "max_token_len": MAX_TOKEN_LEN,
+        "prefix_query_min_len": PREFIX_QUERY_MIN_LEN,
+        "stopwords": STOPWORDS,
+        "docs": [
+            {k: doc[k] for k in ("url", "title", "kind", "page") if k in doc}
+            for doc in docs
+        ],
+        "shards": shard_sizes,
+    }
+    body = json.dumps(manifest, separators=(",", ":"), ensure_ascii=False)
+    (OUT_DIR / "manifest.json").write_text(body, encoding="utf-8")
+    return len(body.encode("utf-8")), shard_sizes
+
+
+def fmt_kb(n: int) -> str:
+    return f"{n / 1024:.1f} KB"
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Build the sharded client-side search index under docs/search/")
+    ap.add_argument("--max-shard-bytes", type=int, default=MAX_SHARD_BYTES,
+                    help="Split prefix shards larger than this many bytes")
+    ap.add_argument("--query", action="append", default=[],
+                    help="Report the shards and bytes a query would fetch (repeatable)")
+    ap.add_argument("--no-cache", action="store_true", help="Ignore cached extraction results")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    cache = {} if args.no_cache else load_cache()
+    fresh = {}
+    stats = {"cache_hits": 0, "cache_misses": 0, "empty_pdfs": []}
+    docs = collect_documents(cache, fresh, stats)
+    save_cache(fresh)
+    t1 = time.perf_counter()
+
+    postings = build_postings(docs)
+    manifest_bytes, shard_sizes = write_index(docs, postings, args.max_shard_bytes)
+    t2 = time.perf_counter()
+
+    total_shard_bytes = sum(shard_sizes.values())
+    largest = max(shard_sizes.items(), key=lambda kv: kv[1]) if shard_sizes else ("-", 0)
+    print(f"Indexed {len(docs)} document(s), {len(postings)} term(s)")
+    print(f"  extraction: {t1 - t0:.2f}s ({stats['cache_hits']} cached, {stats['cache_misses']} extracted)")
+    print(f"  index build: {t2 - t1:.2f}s")
+    print(f"  index size: {fmt_kb(manifest_bytes + total_shard_bytes)} "
+          f"(manifest {fmt_kb(manifest_bytes)}, {len(shard_sizes)} shard(s) {fmt_kb(total_shard_bytes)}, "
+          f"largest '{largest[0]}' {fmt_kb(largest[1])})")
+    for rel in stats["empty_pdfs"]:
+        print(f"  [NO-TEXT] {rel} (no extractable text; indexed by title only)")
+
+    for query in args.query:
+        keys = shards_for_query(query, shard_sizes)
+        fetched = sum(shard_sizes[k] for k in keys)
+        print(f"  query {query!r}: {len(keys)} shard(s) {keys}, {fmt_kb(fetched)} "
+              f"(+ manifest {fmt_kb(manifest_bytes)} on first search)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())